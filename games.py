@@ -12,7 +12,8 @@ Note: small educational prototype inspired by Souls-like mechanics.
 """
 import math, random, time
 import pygame
-from pygame import Rect, Vector2
+from pygame import Rect
+from pygame import K_w, K_a, K_s, K_d, K_UP, K_DOWN, K_LEFT, K_RIGHT, K_j, K_k, K_SPACE, K_ESCAPE
 
 WIDTH, HEIGHT = 1920, 1080
 FPS = 120
@@ -31,16 +32,74 @@ HEAVY_ATTACK_COST = 28
 HEAVY_ATTACK_COOLDOWN = 1.0
 
 ENEMY_SPEED = 100
+ENEMY_RADIUS = 16
+WANDER_CHANCE = 0.01  # per idle tick
+WANDER_DIR_COUNT = 64
+WANDER_DIRS = [(math.cos(i*math.tau/WANDER_DIR_COUNT), math.sin(i*math.tau/WANDER_DIR_COUNT)) for i in range(WANDER_DIR_COUNT)]
 ENEMY_DAMAGE = 12
 
+COL_PLAYER = (50,120,200)
+COL_PLAYER_INVULN = (200,200,60)
+COL_FACING = (220,220,220)
+COL_ENEMY = (180,80,70)
+COL_ENEMY_DEAD = (80,80,80)
+COL_HEALTH_BG = (70,20,20)
+COL_HEALTH_FG = (200,60,60)
+
 # Init
 pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+try:
+    # vsync is best-effort: SDL may hand back an unsynced renderer without
+    # raising, so main_loop still caps the frame rate with clock.tick(FPS)
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED | pygame.DOUBLEBUF, vsync=1)
+except pygame.error:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
 clock = pygame.time.Clock()
 font = pygame.font.SysFont(None, 20)
 
+# Static background grid, rendered once and blitted each frame.
+# Vertical and horizontal lines are each chained into a serpentine polyline.
+# Vertical joins run along y=0 (the first horizontal line) or y=HEIGHT
+# (off-surface); horizontal joins along x=0 or x=WIDTH likewise.
+V_LINES = [((gx,0),(gx,HEIGHT)) for gx in range(0, WIDTH, 64)]
+H_LINES = [((0,gy),(WIDTH,gy)) for gy in range(0, HEIGHT, 64)]
+
+def chain_lines(segments):
+    points = []
+    for i, (a, b) in enumerate(segments):
+        points += (a, b) if i%2==0 else (b, a)
+    return points
+
+GRID_CHAINS = [chain_lines(V_LINES), chain_lines(H_LINES)]
+
+def draw_grid(surf, color=(12,12,20)):
+    for points in GRID_CHAINS:
+        pygame.draw.lines(surf, color, False, points)
+
+GRID_BG = pygame.Surface((WIDTH, HEIGHT)).convert()
+GRID_BG.fill((18,18,30))
+draw_grid(GRID_BG)
+
 def clamp(x, a, b): return max(a, min(b, x))
 
+_LOG_WANDER_MISS = math.log(1 - WANDER_CHANCE)
+
+def wander_ticks():
+    # idle ticks until the next WANDER_CHANCE trial succeeds (geometric sample),
+    # so one RNG call replaces a Bernoulli roll on every idle tick
+    return int(math.log(1.0 - random.random()) / _LOG_WANDER_MISS) + 1
+
+_text_cache = {}
+
+def render_cached(text, color):
+    # font.render rasterises glyphs; HUD strings repeat across most frames
+    surf = _text_cache.get((text, color))
+    if surf is None:
+        if len(_text_cache) > 512:
+            _text_cache.clear()
+        surf = _text_cache[(text, color)] = font.render(text, True, color).convert_alpha()
+    return surf
+
 def draw_bar(surf, rect, pct, bg=(40,40,40), fg=(100,200,100)):
     pygame.draw.rect(surf, bg, rect)
     inner = Rect(rect.x+2, rect.y+2, max(0, int((rect.w-4)*pct)), rect.h-4)
@@ -48,9 +107,10 @@ def draw_bar(surf, rect, pct, bg=(40,40,40), fg=(100,200,100)):
     pygame.draw.rect(surf, (0,0,0), rect, 2)
 
 class Entity:
+    __slots__ = ('pos_x', 'pos_y', 'vel_x', 'vel_y', 'radius', 'hp', 'max_hp', 'alive', 'invuln_timer')
     def __init__(self, pos, radius=18):
-        self.pos = Vector2(pos)
-        self.vel = Vector2(0,0)
+        self.pos_x, self.pos_y = float(pos[0]), float(pos[1])
+        self.vel_x, self.vel_y = 0.0, 0.0
         self.radius = radius
         self.hp = 100
         self.max_hp = 100
@@ -66,12 +126,14 @@ class Entity:
         if self.hp<=0:
             self.alive = False
         return True
-    def draw_health(self, surf, offset=(0,-30)):
+    def draw_health(self, surf, ix, iy, offset=(0,-30)):
+        if self.hp >= self.max_hp: return
         pct = clamp(self.hp/self.max_hp if self.max_hp>0 else 0, 0, 1)
-        rect = Rect(int(self.pos.x-30+offset[0]), int(self.pos.y+offset[1]), 60, 8)
-        draw_bar(surf, rect, pct, bg=(70,20,20), fg=(200,60,60))
+        rect = Rect(ix-30+offset[0], iy+offset[1], 60, 8)
+        draw_bar(surf, rect, pct, bg=COL_HEALTH_BG, fg=COL_HEALTH_FG)
 
 class Player(Entity):
+    __slots__ = ('stamina', 'attack_timer', 'attack_cooldown', 'roll_timer', 'roll_cooldown', 'facing_x', 'facing_y', 'is_rolling')
     def __init__(self, pos):
         super().__init__(pos, radius=16)
         self.max_hp = 120
@@ -81,41 +143,49 @@ class Player(Entity):
         self.attack_cooldown = 0.0
         self.roll_timer = 0.0
         self.roll_cooldown = 0.0
-        self.facing = Vector2(1,0)
+        self.facing_x, self.facing_y = 1.0, 0.0  # kept unit-length
         self.is_rolling = False
         self.invuln_timer = 0.0
 
-    def update(self, dt, keys, mouse_pos, mouse_buttons):
+    def update(self, dt, keys, mouse_buttons, lerp_k, stam_gain):
         self.update_timers(dt)
-        mv = Vector2(0,0)
-        if keys[pygame.K_w] or keys[pygame.K_UP]: mv.y -= 1
-        if keys[pygame.K_s] or keys[pygame.K_DOWN]: mv.y += 1
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]: mv.x -= 1
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]: mv.x += 1
-        if mv.length_squared()>0:
-            mv = mv.normalize()
-            self.facing = mv
+        up = keys[K_w] or keys[K_UP]
+        down = keys[K_s] or keys[K_DOWN]
+        left = keys[K_a] or keys[K_LEFT]
+        right = keys[K_d] or keys[K_RIGHT]
+        jab = keys[K_j] or mouse_buttons[0]
+        heavy = keys[K_k]
+        roll = keys[K_SPACE] or mouse_buttons[2]
+
+        mx = float(right) - left
+        my = float(down) - up
+        if mx or my:
+            inv = 1/math.sqrt(mx*mx + my*my)
+            mx *= inv
+            my *= inv
+            self.facing_x, self.facing_y = mx, my
 
         if not self.is_rolling:
-            self.stamina = clamp(self.stamina + STAMINA_RECOVERY_RATE * dt, 0, STAMINA_MAX)
+            self.stamina = clamp(self.stamina + stam_gain, 0, STAMINA_MAX)
 
-        if self.roll_cooldown<=0 and (keys[pygame.K_SPACE] or mouse_buttons[2]):
+        if self.roll_cooldown<=0 and roll:
             if self.stamina >= 20:
                 self.is_rolling = True
                 self.roll_timer = 0.26
                 self.roll_cooldown = ROLL_COOLDOWN
                 self.invuln_timer = INVULN_TIME
                 self.stamina -= 20
-                self.vel = self.facing * ROLL_SPEED
+                self.vel_x = self.facing_x * ROLL_SPEED
+                self.vel_y = self.facing_y * ROLL_SPEED
 
         attacking = False
-        if self.attack_cooldown<=0 and (keys[pygame.K_j] or mouse_buttons[0]):
+        if self.attack_cooldown<=0 and jab:
             if self.stamina >= LIGHT_ATTACK_COST:
                 self.attack_timer = 0.18
                 self.attack_cooldown = ATTACK_COOLDOWN
                 self.stamina -= LIGHT_ATTACK_COST
                 attacking = True
-        if self.attack_cooldown<=0 and (keys[pygame.K_k]):
+        if self.attack_cooldown<=0 and heavy:
             if self.stamina >= HEAVY_ATTACK_COST:
                 self.attack_timer = 0.34
                 self.attack_cooldown = HEAVY_ATTACK_COOLDOWN
@@ -130,43 +200,46 @@ class Player(Entity):
             self.roll_timer = max(0, self.roll_timer - dt)
             if self.roll_timer==0:
                 self.is_rolling = False
-                self.vel = Vector2(0,0)
+                self.vel_x, self.vel_y = 0.0, 0.0
         if self.roll_cooldown>0:
             self.roll_cooldown = max(0, self.roll_cooldown - dt)
 
         if not self.is_rolling and not attacking:
-            target_vel = mv * PLAYER_SPEED
-            self.vel += (target_vel - self.vel) * clamp(10*dt, 0, 1)
-        self.pos += self.vel * dt
-        self.pos.x = clamp(self.pos.x, 20, WIDTH-20)
-        self.pos.y = clamp(self.pos.y, 20, HEIGHT-20)
+            self.vel_x += (mx*PLAYER_SPEED - self.vel_x) * lerp_k
+            self.vel_y += (my*PLAYER_SPEED - self.vel_y) * lerp_k
+        self.pos_x = clamp(self.pos_x + self.vel_x*dt, 20, WIDTH-20)
+        self.pos_y = clamp(self.pos_y + self.vel_y*dt, 20, HEIGHT-20)
 
     def draw(self, surf):
+        ix, iy = int(self.pos_x), int(self.pos_y)
+        c = (ix, iy)
         if self.invuln_timer>0:
-            pygame.draw.circle(surf, (200,200,60), (int(self.pos.x), int(self.pos.y)), int(self.radius+8), 2)
-        pygame.draw.circle(surf, (50,120,200), (int(self.pos.x), int(self.pos.y)), self.radius)
-        tip = self.pos + self.facing.normalize()* (self.radius+8)
-        pygame.draw.line(surf, (220,220,220), self.pos, tip, 3)
-        self.draw_health(surf)
+            pygame.draw.circle(surf, COL_PLAYER_INVULN, c, int(self.radius+8), 2)
+        pygame.draw.circle(surf, COL_PLAYER, c, self.radius)
+        tip = (ix + self.facing_x*(self.radius+8), iy + self.facing_y*(self.radius+8))
+        pygame.draw.line(surf, COL_FACING, c, tip, 3)
+        self.draw_health(surf, ix, iy)
 
     def attack_hitbox(self):
         if self.attack_timer>0:
             length = ATTACK_RANGE
-            center = self.pos + self.facing.normalize()* (self.radius + length/2)
+            reach = self.radius + length/2
             radius = length/1.6
-            return (center, radius)
+            return (self.pos_x + self.facing_x*reach, self.pos_y + self.facing_y*reach, radius)
         return None
 
 class Enemy(Entity):
+    __slots__ = ('attack_cooldown', 'speed', 'respawn_time', 'wander_in')
     def __init__(self, pos):
-        super().__init__(pos, radius=16)
+        super().__init__(pos, radius=ENEMY_RADIUS)
         self.max_hp = 80
         self.hp = self.max_hp
         self.attack_cooldown = 0.0
         self.speed = ENEMY_SPEED
         self.respawn_time = 0
+        self.wander_in = wander_ticks()
 
-    def update(self, dt, player: Player):
+    def update(self, dt, player: Player, px, py, reach):
         self.update_timers(dt)
         if not self.alive:
             if self.respawn_time<=0:
@@ -178,12 +251,15 @@ class Enemy(Entity):
                     self.hp = self.max_hp
             return
 
-        to_player = player.pos - self.pos
-        dist = to_player.length()
-        if dist < 300:
-            if dist> (self.radius+player.radius+6):
-                self.vel = to_player.normalize()*self.speed
-                self.pos += self.vel * dt
+        dx = px - self.pos_x
+        dy = py - self.pos_y
+        d2 = dx*dx + dy*dy
+        if d2 < 300*300:
+            if d2 > (self.radius+reach)**2:
+                inv = self.speed/math.sqrt(d2)
+                self.vel_x, self.vel_y = dx*inv, dy*inv
+                self.pos_x += self.vel_x * dt
+                self.pos_y += self.vel_y * dt
             else:
                 if self.attack_cooldown<=0 and player.invuln_timer<=0:
                     self.attack_cooldown = 1.0
@@ -191,91 +267,169 @@ class Enemy(Entity):
             if self.attack_cooldown>0:
                 self.attack_cooldown = max(0, self.attack_cooldown - dt)
         else:
-            self.vel *= 0.9
-            if random.random()<0.01:
-                ang = random.random()*math.tau
-                self.vel = Vector2(math.cos(ang), math.sin(ang))* (self.speed*0.5)
-            self.pos += self.vel*dt
-        self.pos.x = clamp(self.pos.x, 20, WIDTH-20)
-        self.pos.y = clamp(self.pos.y, 20, HEIGHT-20)
+            self.vel_x *= 0.9
+            self.vel_y *= 0.9
+            self.wander_in -= 1
+            if self.wander_in<=0:
+                self.wander_in = wander_ticks()
+                cx, cy = WANDER_DIRS[random.randrange(WANDER_DIR_COUNT)]
+                self.vel_x = cx * (self.speed*0.5)
+                self.vel_y = cy * (self.speed*0.5)
+            self.pos_x += self.vel_x*dt
+            self.pos_y += self.vel_y*dt
+        self.pos_x = clamp(self.pos_x, 20, WIDTH-20)
+        self.pos_y = clamp(self.pos_y, 20, HEIGHT-20)
 
     def draw(self, surf):
+        m = self.radius + 30  # body plus health bar half-width
+        if not (-m <= self.pos_x <= WIDTH+m and -m <= self.pos_y <= HEIGHT+m): return
+        ix, iy = int(self.pos_x), int(self.pos_y)
         if not self.alive:
-            pygame.draw.circle(surf, (80,80,80), (int(self.pos.x), int(self.pos.y)), self.radius)
+            pygame.draw.circle(surf, COL_ENEMY_DEAD, (ix, iy), self.radius)
             return
-        pygame.draw.circle(surf, (180,80,70), (int(self.pos.x), int(self.pos.y)), self.radius)
-        self.draw_health(surf)
-
-def circle_collide(a_pos, a_r, b_pos, b_r):
-    return (a_pos - b_pos).length_squared() <= (a_r + b_r)**2
-
-player = Player(Vector2(WIDTH/2, HEIGHT/2))
-enemies = [Enemy(Vector2(random.randint(100, WIDTH-100), random.randint(100, HEIGHT-100))) for _ in range(4)]
+        pygame.draw.circle(surf, COL_ENEMY, (ix, iy), self.radius)
+        self.draw_health(surf, ix, iy)
+
+class Grid:
+    """Uniform bucket grid for broad-phase lookups by position."""
+    def __init__(self, cell=64):
+        self.cell = cell
+        self.buckets = {}
+        self.max_radius = 0
+    def clear(self):
+        self.buckets.clear()
+        self.max_radius = 0
+    def insert(self, ent):
+        if ent.radius > self.max_radius:
+            self.max_radius = ent.radius
+        key = (int(ent.pos_x//self.cell), int(ent.pos_y//self.cell))
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = [ent]
+        else:
+            bucket.append(ent)
+    def query_circle(self, x, y, r):
+        # every entity whose circle could touch this one: pad the bounding box
+        # by the largest inserted radius, since entities are bucketed by centre
+        c = self.cell
+        r += self.max_radius
+        found = []
+        for gx in range(int((x-r)//c), int((x+r)//c)+1):
+            for gy in range(int((y-r)//c), int((y+r)//c)+1):
+                bucket = self.buckets.get((gx, gy))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+class EnemyPool:
+    def __init__(self, count, margin=100):
+        self.grid = Grid()
+        self.spawn(count, margin)
+    def __iter__(self):
+        return iter(self.enemies)
+    def spawn(self, count, margin=60):
+        self.enemies = [Enemy((random.randint(margin, WIDTH-margin), random.randint(margin, HEIGHT-margin))) for _ in range(count)]
+    def alive_count(self):
+        return sum(1 for e in self.enemies if e.alive)
+    def update(self, dt, player):
+        # player-derived values are shared by every enemy, so read them once
+        px, py = player.pos_x, player.pos_y
+        reach = player.radius + 6
+        grid = self.grid
+        grid.clear()
+        for e in self.enemies:
+            e.update(dt, player, px, py, reach)
+            if e.alive:
+                grid.insert(e)
+
+def circle_collide(ax, ay, a_r, bx, by, b_r):
+    dx = ax - bx
+    dy = ay - by
+    return dx*dx + dy*dy <= (a_r + b_r)**2
+
+player = Player((WIDTH/2, HEIGHT/2))
+pool = EnemyPool(4)
 
 def draw_hud(surf, player):
     draw_bar(surf, Rect(12,12,220,22), clamp(player.hp/player.max_hp, 0, 1), bg=(50,10,10), fg=(220,80,60))
-    hp_text = font.render(f"HP: {int(player.hp)}/{player.max_hp}", True, (255,255,255))
+    hp_text = render_cached(f"HP: {int(player.hp)}/{player.max_hp}", (255,255,255))
     surf.blit(hp_text, (14,14))
     draw_bar(surf, Rect(12,42,220,14), clamp(player.stamina/STAMINA_MAX, 0, 1), bg=(30,30,30), fg=(160,200,120))
-    st_text = font.render(f"STA: {int(player.stamina)}", True, (255,255,255))
+    st_text = render_cached(f"STA: {int(player.stamina)}", (255,255,255))
     surf.blit(st_text, (14,42))
     y = 68
-    surf.blit(font.render(f"Atk CD: {player.attack_cooldown:.2f}s", True, (220,220,220)), (14,y))
-    surf.blit(font.render(f"Roll CD: {player.roll_cooldown:.2f}s", True, (220,220,220)), (120,y))
+    surf.blit(render_cached(f"Atk CD: {player.attack_cooldown:.2f}s", (220,220,220)), (14,y))
+    surf.blit(render_cached(f"Roll CD: {player.roll_cooldown:.2f}s", (220,220,220)), (120,y))
 
 def main_loop():
+    # bind hot-loop callables once so the loop body uses fast local loads
+    event_get = pygame.event.get
+    get_keys = pygame.key.get_pressed
+    get_mb = pygame.mouse.get_pressed
+    flip = pygame.display.flip
+    tick = clock.tick
+    now = time.perf_counter
+    rnd = random.random
+    blit = screen.blit
+    draw_circle = pygame.draw.circle
+    QUIT, KEYDOWN = pygame.QUIT, pygame.KEYDOWN
+
     running = True
+    dt = 1.0/FPS
+    last = now()
     while running:
-        dt = clock.tick(FPS)/1000.0
-        for ev in pygame.event.get():
-            if ev.type==pygame.QUIT:
+        for ev in event_get():
+            if ev.type==QUIT:
                 running = False
-            if ev.type==pygame.KEYDOWN and ev.key==pygame.K_ESCAPE:
+            if ev.type==KEYDOWN and ev.key==K_ESCAPE:
                 running = False
 
-        keys = pygame.key.get_pressed()
-        mouse_buttons = pygame.mouse.get_pressed()
-        mouse_pos = Vector2(pygame.mouse.get_pos())
+        keys = get_keys()
+        mouse_buttons = get_mb()
+
+        # dt-derived factors, computed once per frame
+        lerp_k = min(10*dt, 1.0)
+        stam_gain = STAMINA_RECOVERY_RATE*dt
 
-        player.update(dt, keys, mouse_pos, mouse_buttons)
-        for e in enemies:
-            e.update(dt, player)
+        player.update(dt, keys, mouse_buttons, lerp_k, stam_gain)
+        pool.update(dt, player)
 
         hit = player.attack_hitbox()
         if hit:
-            center, radius = hit
-            for en in enemies:
-                if en.alive and circle_collide(center, radius, en.pos, en.radius):
+            cx, cy, radius = hit
+            for en in pool.grid.query_circle(cx, cy, radius):
+                if en.alive and circle_collide(cx, cy, radius, en.pos_x, en.pos_y, en.radius):
                     en.take_damage(28)
-                    dir = (en.pos - player.pos)
-                    if dir.length_squared()>0:
-                        en.pos += dir.normalize()*12
+                    dx = en.pos_x - player.pos_x
+                    dy = en.pos_y - player.pos_y
+                    d2 = dx*dx + dy*dy
+                    if d2>0:
+                        inv = 12/math.sqrt(d2)
+                        en.pos_x += dx*inv
+                        en.pos_y += dy*inv
 
-        screen.fill((18,18,30))
-        for gx in range(0, WIDTH, 64):
-            pygame.draw.line(screen, (12,12,20), (gx,0),(gx,HEIGHT))
-        for gy in range(0, HEIGHT, 64):
-            pygame.draw.line(screen, (12,12,20), (0,gy),(WIDTH,gy))
+        blit(GRID_BG, (0,0))
 
-        for en in enemies:
+        for en in pool:
             en.draw(screen)
         player.draw(screen)
 
         if hit:
-            c, r = hit
-            pygame.draw.circle(screen, (240,220,120), (int(c.x), int(c.y)), int(r), 2)
+            cx, cy, r = hit
+            draw_circle(screen, (240,220,120), (int(cx), int(cy)), int(r), 2)
 
         draw_hud(screen, player)
 
-        alive_n = sum(1 for e in enemies if e.alive)
-        screen.blit(font.render(f"Enemies alive: {alive_n}", True, (240,240,240)), (WIDTH-160, 12))
+        alive_n = pool.alive_count()
+        blit(render_cached(f"Enemies alive: {alive_n}", (240,240,240)), (WIDTH-160, 12))
 
-        if alive_n==0 and random.random()<0.01:
-            enemies.clear()
-            for _ in range(4):
-                enemies.append(Enemy(Vector2(random.randint(60, WIDTH-60), random.randint(60, HEIGHT-60))))
+        if alive_n==0 and rnd()<0.01:
+            pool.spawn(4)
 
-        pygame.display.flip()
+        flip()
+        tick(FPS)
+        t = now()
+        dt, last = t - last, t
 
     pygame.quit()
 